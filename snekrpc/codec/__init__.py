@@ -1,5 +1,5 @@
-import inspect
 import datetime
+from types import GeneratorType
 
 import temporenc
 
@@ -9,11 +9,16 @@ from .. import registry
 
 CodecMeta = registry.create_metaclass(__name__)
 
+_cls_cache = {}
+
 def get(name, codec_args=None):
     """Returns an instance of the Codec matching *name*."""
     if isinstance(name, Codec):
         return name
-    cls = CodecMeta.get(name)
+    try:
+        cls = _cls_cache[name]
+    except KeyError:
+        cls = _cls_cache[name] = CodecMeta.get(name)
     return cls(**(codec_args or {}))
 
 class Codec(utils.compat.with_metaclass(CodecMeta, object)):
@@ -30,24 +35,24 @@ class Codec(utils.compat.with_metaclass(CodecMeta, object)):
         try:
             return self.encode(msg)
         except Exception as e:
-            raise errors.EncodeError('{}: msg={}'.format(e,
-                utils.format.elide(repr(msg))))
+            raise errors.EncodeError(e, msg)
 
     def _decode(self, data):
         """Wrapper that provides decoding error context. Used internally."""
         try:
             return self.decode(data)
         except Exception as e:
-            raise errors.DecodeError('{}: data={!r}'.format(e,
-                utils.format.elide(repr(data))))
+            raise errors.DecodeError(e, data)
 
 ## combined codecs
 
 def encode(obj):
-    if isinstance(obj, datetime.datetime):
-        return encode_datetime(obj)
-    elif inspect.isgenerator(obj):
+    # a type identity check is cheaper than inspect.isgenerator on this
+    # per-object hot path (datetime keeps isinstance for subclasses)
+    if type(obj) is GeneratorType:
         return encode_generator(obj)
+    elif isinstance(obj, datetime.datetime):
+        return encode_datetime(obj)
     return obj
 
 def decode(obj):
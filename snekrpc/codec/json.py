@@ -8,9 +8,15 @@ class JsonCodec(Codec):
 
     def __init__(self, encoding=None):
         self._encoding = encoding or 'utf8'
+        # cached instances skip the per-call setup in json.dumps/loads
+        self._enc = json.JSONEncoder(
+            separators=(',', ':'), default=encode).encode
+        self._dec = json.JSONDecoder(object_hook=decode).decode
 
     def encode(self, msg):
-        return json.dumps(msg, default=encode).encode(self._encoding)
+        return self._enc(msg).encode(self._encoding)
 
     def decode(self, data):
-        return json.loads(data, object_hook=decode)
+        if isinstance(data, bytes):
+            data = data.decode(self._encoding)
+        return self._dec(data)
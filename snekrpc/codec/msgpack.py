@@ -1,13 +1,58 @@
 from __future__ import absolute_import
 
+import struct
+import datetime
+import threading
+from types import GeneratorType
+
 import msgpack
-from . import Codec, encode, decode
+import temporenc
+
+from . import Codec, decode_generator
+
+_bin32 = struct.Struct('>I')
+
+# ext type codes
+EXT_DATETIME = 1
+EXT_GENERATOR = 2
+
+def _default(obj):
+    # aware datetimes are handled natively by the packer; only naive
+    # datetimes reach this hook
+    if isinstance(obj, datetime.datetime):
+        return msgpack.ExtType(EXT_DATETIME, temporenc.packb(obj))
+    elif type(obj) is GeneratorType:
+        return msgpack.ExtType(EXT_GENERATOR, b'')
+    return obj
+
+def _ext_hook(code, data):
+    if code == EXT_DATETIME:
+        return temporenc.unpackb(data).datetime()
+    elif code == EXT_GENERATOR:
+        return decode_generator(None)
+    return msgpack.ExtType(code, data)
 
 class MsgpackCodec(Codec):
     _name_ = 'msgpack'
 
+    def __init__(self):
+        # Packer keeps an internal buffer, so it cannot be shared between
+        # server threads. Cache one per thread to skip the per-call
+        # allocation done by msgpack.packb.
+        self._local = threading.local()
+
     def encode(self, msg):
-        return msgpack.packb(msg, use_bin_type=True, default=encode)
+        if isinstance(msg, (bytes, bytearray, memoryview)):
+            # binary payloads can be framed directly as msgpack bin32,
+            # skipping the packer and its internal buffer copy
+            return b''.join((b'\xc6', _bin32.pack(len(msg)), msg))
+        try:
+            packer = self._local.packer
+        except AttributeError:
+            packer = self._local.packer = msgpack.Packer(
+                use_bin_type=True, datetime=True, default=_default)
+        return packer.pack(msg)
 
     def decode(self, data):
-        return msgpack.unpackb(data, use_list=True, raw=False, object_hook=decode)
+        return msgpack.unpackb(data, use_list=True, raw=False,
+            timestamp=3, ext_hook=_ext_hook)
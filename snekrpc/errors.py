@@ -58,11 +58,38 @@ class ProtocolOpError(SnekRPCError):
 
 ## serialization
 
-class EncodeError(SnekRPCError):
+class CodecError(SnekRPCError):
+    """Adds payload context for errors raised by a codec.
+
+    The payload repr is only built if the error is actually formatted,
+    keeping the cost off paths that catch and retry.
+    """
+    _label = 'payload'
+
+    def __init__(self, cause, payload=None):
+        super(CodecError, self).__init__(cause)
+        self._cause = cause
+        self._payload = payload
+
+    def __str__(self):
+        payload = self._payload
+        if payload is None:
+            return str(self._cause)
+        if isinstance(payload, (bytes, bytearray)) and len(payload) > 64:
+            # bound the repr cost for large binary payloads
+            pstr = '{}B: {!r}...'.format(len(payload), bytes(payload[:32]))
+        else:
+            from .utils.format import elide
+            pstr = elide(repr(payload))
+        return '{}: {}={}'.format(self._cause, self._label, pstr)
+
+class EncodeError(CodecError):
     """Adds context for errors raised when packing."""
+    _label = 'msg'
 
-class DecodeError(SnekRPCError):
+class DecodeError(CodecError):
     """Adds context for errors raised when unpacking."""
+    _label = 'data'
 
 ## registry
 
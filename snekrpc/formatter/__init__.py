@@ -1,18 +1,24 @@
 from __future__ import print_function
 
-import inspect
 import importlib
+from types import GeneratorType
 
 from .. import utils
 from .. import registry
 
 FormatterMeta = registry.create_metaclass(__name__)
 
+_cls_cache = {}
+
 def get(name, **kwargs):
     """Returns an instance of the Formatter matching *name*."""
     if isinstance(name, Formatter):
         return name
-    cls = load(name) if '.' in name else FormatterMeta.get(name)
+    try:
+        cls = _cls_cache[name]
+    except KeyError:
+        cls = load(name) if '.' in name else FormatterMeta.get(name)
+        _cls_cache[name] = cls
     return cls(**kwargs)
 
 def load(name):
@@ -23,7 +29,7 @@ def load(name):
 
 class Formatter(utils.compat.with_metaclass(FormatterMeta, object)):
     def process(self, res):
-        if inspect.isgenerator(res):
+        if type(res) is GeneratorType:
             for r in res:
                 self.print(r)
         else:
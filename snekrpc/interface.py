@@ -1,3 +1,6 @@
+import itertools
+from types import GeneratorType
+
 from . import logs
 from . import utils
 from . import errors
@@ -40,11 +43,15 @@ class Interface(object):
     @codec.setter
     def codec(self, codec):
         self._codec = codec and get_codec(codec)
-        log.debug('codec: %s', self._codec and self._codec._name_)
+        if log.isEnabledFor(logs.DEBUG):
+            log.debug('codec: %s', self._codec and self._codec._name_)
 
 class Client(Interface):
     def __init__(self, transport=None, codec=None, version=None,
             retry_count=None, retry_interval=None):
+        # set first: __getattr__ depends on it
+        self._proxies = {}
+
         super(Client, self).__init__(transport, codec, version)
 
         self._con = None
@@ -66,6 +73,7 @@ class Client(Interface):
         if self._con:
             self._con.close()
         self._con = None
+        self._proxies.clear()
 
     ## remote services ##
 
@@ -75,17 +83,25 @@ class Client(Interface):
     
     def __getattr__(self, name):
         """Convenience access to `service()`.
-        
+
         Note that this will not work if the service name is that same
         as a `Client` attribute. Use the `service()` method in those cases.
         """
         try:
-            return self.service(name)
+            return self._proxies[name]
+        except KeyError:
+            pass
+
+        try:
+            proxy = self.service(name)
         except errors.RemoteError as e:
             if e.name != 'KeyError':
                 raise
             raise AttributeError(name)
 
+        self._proxies[name] = proxy
+        return proxy
+
     def service(self, name, metadata=True):
         """Returns a `ServiceProxy` instance providing access to a remote
         service.
@@ -99,12 +115,58 @@ class Client(Interface):
     def service_names(self):
         return self.service('_meta').service_names()
 
+    def batch(self):
+        """Returns a `Batch` for sending several commands in one round trip."""
+        return Batch(self)
+
+class Batch(object):
+    """Collects commands to send to the remote interface in a single round
+    trip.
+
+    `call()` records a command and returns its index in the batch. The
+    result of an earlier call can be fed to a later one by passing its
+    index as *input_from*; it is appended to the call's positional
+    arguments. Calls that depend on a failed call are not executed.
+
+    `commit()` sends the batch and returns a list with one result per
+    call. Failed calls are returned as (not raised) `RemoteError`
+    instances.
+
+    Streaming (generator) arguments and results are not supported.
+    """
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def call(self, svc_name, cmd_name, *args, **kwargs):
+        input_from = kwargs.pop('input_from', -1)
+        # a generator would be encoded as a stream placeholder and
+        # silently arrive empty on the server (see `recv_batch`)
+        for arg in itertools.chain(args, kwargs.values()):
+            if isinstance(arg, GeneratorType):
+                raise errors.ParameterError(
+                    'streams are not supported in a batch')
+        self._calls.append((svc_name, cmd_name, args, kwargs, input_from))
+        return len(self._calls) - 1
+
+    def commit(self):
+        con = self._client.connect()
+        try:
+            results = con.get_protocol().send_batch(self._calls)
+        except errors.TransportError:
+            self._client.close()
+            raise
+        return [value if ok else errors.RemoteError(*value)
+            for ok, value in results]
+
 class Server(Interface):
     def __init__(self, transport=None, codec=None, version=None,
             remote_tracebacks=False):
         super(Server, self).__init__(transport, codec or DEFAULT_CODEC, version)
 
         self._services = {}
+        self._public_names = []
+        self._services_version = 0
         self.add_service('meta', {'server': self}, '_meta')
 
         self.remote_tracebacks = remote_tracebacks
@@ -133,7 +195,15 @@ class Server(Interface):
             service_args = {'server': self}
 
         svc = get_service(service, service_args, alias)
-        self._services[svc._name_] = svc
+
+        # interned names hash by identity in the common case, since
+        # command dispatch looks services up by freshly decoded strings
+        name = svc._name_
+        if type(name) is str:
+            name = utils.compat.intern(name)
+
+        self._services[name] = svc
+        self._update_public_names()
 
         log.debug('service added: %s', svc._name_)
 
@@ -141,13 +211,21 @@ class Server(Interface):
 
     def remove_service(self, name):
         del self._services[name]
+        self._update_public_names()
         return self
 
+    def _update_public_names(self):
+        # recomputed on mutation so the per-request reads stay O(1). the
+        # version lets caches of service metadata invalidate themselves
+        self._public_names = [
+            k for k in self._services if k and not k.startswith('_')]
+        self._services_version += 1
+
     def service(self, name):
         return self._services[name]
 
     def services(self):
-        return [self.service(n) for n in self.service_names()]
+        return [self._services[n] for n in self._public_names]
 
     def service_names(self):
-        return [k for k in self._services if k and not k.startswith('_')]
+        return list(self._public_names)
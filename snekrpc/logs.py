@@ -1,7 +1,13 @@
 import sys
+import functools
 from logging import *
 
-get = getLogger
+# getLogger is internally memoized, but takes the manager lock on every
+# call; the cache returns repeat lookups without it
+@functools.lru_cache(maxsize=None)
+def get(name=None):
+    return getLogger(name)
+
 log = get(__name__)
 
 def init(debug_level=0, log_exceptions=True):
@@ -33,7 +39,9 @@ def init(debug_level=0, log_exceptions=True):
     get('hpack').setLevel(INFO)
 
 def handle_exception(etype, evalue, etb):
-    if issubclass(etype, KeyboardInterrupt):
+    # identity check first: issubclass walks the MRO and this hook runs
+    # in interpreter-shutdown contexts where cheap matters
+    if etype is KeyboardInterrupt or issubclass(etype, KeyboardInterrupt):
         sys.__excepthook__(etype, evalue, etb)
         return
     log.error('unhandled exception', exc_info=(etype, evalue, etb))
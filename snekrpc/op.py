@@ -1,14 +1,18 @@
-class Op:
+from enum import IntEnum
+
+class Op(IntEnum):
     handshake    = 0 # <raw> initial handshake (codec)
     command      = 1 # call a command (svc_name, cmd_name, args, kwargs)
     data         = 2 # return data (data)
     error        = 3 # return error (name, msg, tb)
     stream_start = 4 # start of stream ([name])
     stream_end   = 5 # end of stream
+    stream_batch = 6 # batch of stream data ([data, ...])
+    batch        = 7 # call several commands ([(svc_name, cmd_name, args, kwargs, input_from), ...])
 
     @classmethod
     def to_str(cls, op):
-        for k, v in vars(cls).items():
-            if v == op:
-                return k
-        raise ValueError('invalid op code: {}'.format(op))
+        try:
+            return cls(op).name
+        except ValueError:
+            raise ValueError('invalid op code: {}'.format(op))
@@ -1,5 +1,5 @@
-import inspect
 import traceback
+from types import GeneratorType
 
 from .op import Op
 from . import logs
@@ -8,11 +8,31 @@ from . import errors
 
 log = logs.get(__name__)
 
+# bounds the frames formatted for remote tracebacks. deep stacks would
+# otherwise make error frames arbitrarily expensive to build and ship
+TRACEBACK_LIMIT = 20
+
+def _format_tb(e):
+    return ''.join(traceback.format_exception(
+        type(e), e, e.__traceback__, limit=TRACEBACK_LIMIT)).rstrip()
+
 class Protocol(object):
+    __slots__ = ('_ifc', '_con', '_debug', '_cmd_cache', '_cmd_version',
+        'metadata')
+
     def __init__(self, interface, con, metadata=None):
         self._ifc = interface
         self._con = con
 
+        # cached per connection: isEnabledFor walks the logger hierarchy
+        # and would otherwise run several times per message
+        self._debug = log.isEnabledFor(logs.DEBUG)
+
+        # resolved commands, cached against the server's service version
+        # so that add_service/remove_service apply to connected clients
+        self._cmd_cache = {}
+        self._cmd_version = None
+
         self.metadata = metadata or {}
 
     @property
@@ -26,7 +46,15 @@ class Protocol(object):
     ## protocol ##
 
     def handle(self):
+        # bound as locals: this loop runs once per message for the life
+        # of the connection
         recv = self._con.recv_msg
+        recv_cmd = self.recv_cmd
+        recv_batch = self.recv_batch
+        send_err = self.send_err
+        TransportError = errors.TransportError
+        OP_COMMAND = Op.command
+        OP_BATCH = Op.batch
 
         while True:
             try:
@@ -34,44 +62,48 @@ class Protocol(object):
 
                 if msg is None:
                     return
-                elif msg.op == Op.command:
-                    self.recv_cmd(msg)
+                elif msg.op == OP_COMMAND:
+                    recv_cmd(msg)
+                elif msg.op == OP_BATCH:
+                    recv_batch(msg)
                 else:
                     raise errors.ProtocolOpError(msg.op)
 
-            except errors.TransportError as e:
+            except TransportError as e:
                 logger = (log.exception
                     if log.isEnabledFor(logs.DEBUG) else log.error)
                 logger('transport error (%s): %s',
                     self.remote_url, utils.format.format_exc(e))
 
             except Exception as e:
-                self.send_err(e)
+                send_err(e)
 
     def recv_cmd(self, msg):
         """Processes commands received from the remote interface."""
         svc_name, cmd_name, args, kwargs = msg.data
 
-        svc = self._ifc.service(svc_name)
-        func = getattr(svc, cmd_name)
-
-        # convert any stream to a generator
-        recv_args = []
-        recv_kwargs = {}
-
-        for arg in args:
-            if inspect.isgenerator(arg):
-                arg = self.recv_stream()
-            recv_args.append(arg)
+        version = self._ifc._services_version
+        if version != self._cmd_version:
+            self._cmd_cache.clear()
+            self._cmd_version = version
+
+        key = (svc_name, cmd_name)
+        try:
+            func = self._cmd_cache[key]
+        except KeyError:
+            func = self._cmd_cache[key] = getattr(
+                self._ifc.service(svc_name), cmd_name)
+
+        # convert any stream placeholder to a generator, in place. the
+        # common no-stream case rebuilds nothing
+        for i, arg in enumerate(args):
+            if type(arg) is GeneratorType:
+                args[i] = self.recv_stream()
         for name, arg in kwargs.items():
-            if inspect.isgenerator(arg):
-                arg = self.recv_stream()
-            recv_kwargs[name] = arg
-
-        args = recv_args
-        kwargs = recv_kwargs
+            if type(arg) is GeneratorType:
+                kwargs[name] = self.recv_stream()
 
-        if log.isEnabledFor(logs.DEBUG):
+        if self._debug:
             log.debug('cmd: %s <- %s',
                 utils.format.format_cmd(svc_name, cmd_name, args, kwargs),
                 self.remote_url)
@@ -79,40 +111,100 @@ class Protocol(object):
         # call
         res = func(*args, **kwargs)
 
-        if inspect.isgenerator(res):
-            self.send_stream(res)
+        if type(res) is GeneratorType:
+            meta = getattr(func, '_meta', None)
+            self.send_stream(res, meta.get('batch_bytes') if meta else None)
         else:
             self._con.send_msg(Op.data, res)
 
+    def recv_batch(self, msg):
+        """Processes a batch of commands received from the remote interface.
+
+        Each call is a `(svc_name, cmd_name, args, kwargs, input_from)`
+        tuple. If *input_from* is not negative, the result of the call at
+        that index is appended to *args*. Calls that depend on a failed
+        call are not executed.
+
+        Results are returned as a list of `(ok, value)` pairs, where *value*
+        is the command result, or `(name, msg, tb)` error info if *ok* is
+        false. Streaming commands are not supported in a batch.
+        """
+        results = []
+
+        for call in msg.data:
+            svc_name, cmd_name, args, kwargs, input_from = call
+
+            try:
+                if input_from >= 0:
+                    ok, value = results[input_from]
+                    if not ok:
+                        results.append((False, value))
+                        continue
+                    args = list(args) + [value]
+
+                svc = self._ifc.service(svc_name)
+                func = getattr(svc, cmd_name)
+
+                if self._debug:
+                    log.debug('batch cmd: %s <- %s',
+                        utils.format.format_cmd(
+                            svc_name, cmd_name, args, kwargs),
+                        self.remote_url)
+
+                res = func(*args, **kwargs)
+                if type(res) is GeneratorType:
+                    raise errors.ParameterError(
+                        'streams are not supported in a batch')
+
+                results.append((True, res))
+            except Exception as e:
+                if log.isEnabledFor(logs.ERROR):
+                    log.exception('%s: %s', e.__class__.__name__, e)
+                tb = _format_tb(e) if self._ifc.remote_tracebacks else ''
+                results.append((False,
+                    utils.encoding.to_unicode(
+                        (e.__class__.__name__, str(e), tb))))
+
+        self._con.send_msg(Op.data, results)
+
+    def send_batch(self, calls):
+        """Sends a batch of commands to the remote interface in a single
+        round trip. See `recv_batch` for the format of *calls*."""
+        self._con.send_msg(Op.batch, calls)
+
+        msg = self._con.recv_msg()
+
+        if msg.op == Op.data:
+            return msg.data
+        elif msg.op == Op.error:
+            raise errors.RemoteError(*msg.data)
+        else:
+            raise errors.ProtocolOpError(msg.op)
+
     def send_cmd(self, svc_name, cmd_name, *args, **kwargs):
         """Sends a command operation to the remote interface."""
-        if log.isEnabledFor(logs.DEBUG):
+        if self._debug:
             log.debug('cmd: %s -> %s',
                 utils.format.format_cmd(svc_name, cmd_name, args, kwargs),
                 self.remote_url)
 
-        # convert any generator arg to a stream
+        # find any generator arg to send as a stream. args/kwargs are
+        # passed along as-is: the codec encodes the generator itself as a
+        # placeholder
         stream = None
-        send_args = []
-        send_kwargs = {}
 
         for arg in args:
-            if inspect.isgenerator(arg):
+            if type(arg) is GeneratorType:
                 if stream is not None:
                     err = 'only one stream param is possible'
                     raise errors.ParameterError(err)
                 stream = arg
-            send_args.append(arg)
-        for name, arg in kwargs.items():
-            if inspect.isgenerator(arg):
+        for arg in kwargs.values():
+            if type(arg) is GeneratorType:
                 if stream is not None:
                     err = 'only one stream param is possible'
                     raise errors.ParameterError(err)
                 stream = arg
-            send_kwargs[name] = arg
-
-        args = send_args
-        kwargs = send_kwargs
 
         # send command
         self._con.send_msg(Op.command, (svc_name, cmd_name, args, kwargs))
@@ -149,6 +241,9 @@ class Protocol(object):
                 raise errors.ReceiveInterrupted()
             elif msg.op == Op.data:
                 yield msg.data
+            elif msg.op == Op.stream_batch:
+                for x in msg.data:
+                    yield x
             elif msg.op == Op.error:
                 raise errors.RemoteError(*msg.data)
             elif msg.op == Op.stream_end:
@@ -156,17 +251,43 @@ class Protocol(object):
             else:
                 raise errors.ProtocolOpError(msg.op)
 
-    def send_stream(self, it):
+    def send_stream(self, it, batch_bytes=None):
+        """Sends the values of the iterator *it* as a stream.
+
+        If *batch_bytes* is set, values are accumulated and sent in batches
+        of roughly *batch_bytes* each, amortizing the per-message encode and
+        send overhead. This should only be used for streams that do not
+        care about per-value delivery latency.
+        """
         send = self._con.send_msg
         send(Op.stream_start)
-        for x in it:
-            send(Op.data, x)
+
+        if batch_bytes:
+            batch = []
+            size = 0
+            for x in it:
+                batch.append(x)
+                try:
+                    size += len(x)
+                except TypeError:
+                    size += 1
+                if size >= batch_bytes:
+                    send(Op.stream_batch, batch)
+                    batch = []
+                    size = 0
+            if batch:
+                send(Op.stream_batch, batch)
+        else:
+            for x in it:
+                send(Op.data, x)
+
         send(Op.stream_end)
 
     def send_err(self, e):
         name = e.__class__.__name__
         msg = str(e)
-        tb = traceback.format_exc().rstrip() if self._ifc.remote_tracebacks else ''
+        tb = _format_tb(e) if self._ifc.remote_tracebacks else ''
 
-        log.exception('%s: %s', name, msg)
+        if log.isEnabledFor(logs.ERROR):
+            log.exception('%s: %s', name, msg)
         self._con.send_msg(Op.error, utils.encoding.to_unicode((name, msg, tb)))
@@ -9,12 +9,17 @@ log = logs.get(__name__)
 _metaclasses = {}
 _init_lock = threading.Lock()
 _initialized = threading.Event()
+# fast-path flag: Event.wait() acquires a lock even when already set,
+# and get()/names() run on every registry lookup
+_init_done = False
 
 def init():
     """Import and register modules for all known metaclass registries.
 
     Safe to call multiple times from multiple threads.
     """
+    global _init_done
+
     with _init_lock:
         if _initialized.is_set():
             return
@@ -23,6 +28,7 @@ def init():
             Meta.init(meta_name)
 
         _initialized.set()
+        _init_done = True
 
 def create_metaclass(meta_name):
     class RegistryMeta(type):
@@ -36,18 +42,23 @@ def create_metaclass(meta_name):
                         'already registered: {}'.format(reg_name))
                 else:
                     RegistryMeta.registry[reg_name] = cls
+                    # utf8 name, precomputed for wire use (e.g. the
+                    # codec handshake reply)
+                    cls._name_bytes_ = reg_name.encode('utf8')
                     log.debug('registered %s: %s',
                         meta_name.split('.', 1)[1], reg_name)
             super(RegistryMeta, cls).__init__(name, bases, dct)
 
         @classmethod
         def get(cls, name):
-            _initialized.wait()
+            if not _init_done:
+                _initialized.wait()
             return cls.registry[name]
 
         @classmethod
         def names(cls):
-            _initialized.wait()
+            if not _init_done:
+                _initialized.wait()
             return tuple(cls.registry.keys())
 
         @classmethod
@@ -1,5 +1,6 @@
 import inspect
 import itertools
+from types import GeneratorType
 
 from .. import logs
 from .. import utils
@@ -9,6 +10,15 @@ from ..utils.encoding import to_unicode
 
 log = logs.get(__name__)
 
+if utils.compat.PY3:
+    # keyword names collected via ** are always str on py3, so the
+    # proxy call path skips the per-call dict walk entirely
+    def _coerce_kwargs(kwargs):
+        return kwargs
+else:
+    def _coerce_kwargs(kwargs):
+        return to_unicode(kwargs, dict_keys_only=True)
+
 def parse_alias(name):
     try:
         name, alias = name.split(':')
@@ -35,6 +45,25 @@ def get(name, service_args=None, alias=None):
 
     return obj
 
+def command_names(cls):
+    """Returns the command attribute names for a Service class.
+
+    The `dir()` scan runs once per class; the result is cached on the
+    class itself.
+    """
+    try:
+        return cls.__dict__['_command_names_']
+    except KeyError:
+        pass
+
+    names = tuple(
+        name for name in dir(cls)
+        if not name.startswith('_')
+        and getattr(getattr(cls, name), '_meta', None) is not None)
+
+    cls._command_names_ = names
+    return names
+
 def service_to_dict(svc):
     """Returns service metadata as a dict."""
     f2d = utils.function.func_to_dict
@@ -43,16 +72,9 @@ def service_to_dict(svc):
         'name': svc._name_,
         'doc': svc.__doc__,
         }
-    d['commands'] = cmds = []
 
-    # find commands
-    for name in dir(svc):
-        if name.startswith('_'):
-            continue
-        attr = getattr(svc, name)
-        meta = getattr(attr, '_meta', None)
-        if meta is not None:
-            cmds.append(f2d(attr))
+    d['commands'] = [
+        f2d(getattr(svc, name)) for name in command_names(type(svc))]
 
     return d
 
@@ -78,6 +100,7 @@ class ServiceProxy(object):
         self._svc_name = to_unicode(name)
         self._client = client
         self._commands = cmds = {}
+        self._raw_cache = {}
 
         self._retry = utils.retry.Retry(
             client.retry_count, client.retry_interval,
@@ -99,28 +122,34 @@ class ServiceProxy(object):
                 return self._commands[cmd_name]
             except KeyError:
                 raise AttributeError(cmd_name)
-        # return a raw wrapper
-        return wrap_call(self, cmd_name)
+        # return a raw wrapper, built once per name. setdefault keeps a
+        # racing build from returning two different wrappers
+        try:
+            return self._raw_cache[cmd_name]
+        except KeyError:
+            return self._raw_cache.setdefault(
+                cmd_name, wrap_call(self, cmd_name))
 
     def __dir__(self):
         return list(self._commands.keys()) + super(ServiceProxy, self).__dir__()
 
 def wrap_call(proxy, cmd_name, cmd_def=None):
-    # Protocol.send_cmd() is wrapped by two functions here in order to simplify
-    # connection cleanup for both regular and generator calls.
-    # For that reason call() is a generator, and call_wrap() handles the
-    # case where the command is not a generator
+    cmd_name = to_unicode(cmd_name)
+
+    # without metadata the response type is only known at call time, so
+    # call() is a generator that first yields whether the command streams,
+    # and call_wrap() unwraps the non-streaming case
     def call(*args, **kwargs):
         # with proxy._client.connect() as con:
         con = proxy._client.connect()
         try:
             proto = con.get_protocol({proxy._svc_name: proxy._commands})
 
-            res = proto.send_cmd(proxy._svc_name, to_unicode(cmd_name),
-                *args, **to_unicode(kwargs, dict_keys_only=True))
+            res = proto.send_cmd(proxy._svc_name, cmd_name,
+                *args, **_coerce_kwargs(kwargs))
 
             # notify call_wrap of type of response
-            isgen = inspect.isgenerator(res)
+            isgen = type(res) is GeneratorType
             yield isgen
 
             if isgen:
@@ -137,13 +166,42 @@ def wrap_call(proxy, cmd_name, cmd_def=None):
         isgen = next(gen) # get type of response
         return iter(StreamInitiator(gen)) if isgen else next(gen)
 
-    if cmd_def and cmd_def.get('isgen'):
-        retry_wrap = lambda *a, **k: proxy._retry.call_gen(call_wrap, *a, **k)
+    if not cmd_def:
+        return lambda *a, **k: proxy._retry.call(call_wrap, *a, **k)
+
+    # with metadata the response type is known at wrap time, so a closure
+    # specialized for the command is picked once here instead of checking
+    # the response on every call
+    if cmd_def.get('isgen'):
+        def call_stream(*args, **kwargs):
+            con = proxy._client.connect()
+            try:
+                proto = con.get_protocol({proxy._svc_name: proxy._commands})
+
+                res = proto.send_cmd(proxy._svc_name, cmd_name,
+                    *args, **_coerce_kwargs(kwargs))
+
+                for r in res:
+                    yield r
+            except errors.TransportError:
+                proxy._client.close()
+                raise
+
+        retry_wrap = lambda *a, **k: proxy._retry.call_gen(call_stream, *a, **k)
     else:
-        retry_wrap = lambda *a, **k: proxy._retry.call(call_wrap, *a, **k)
+        def call_value(*args, **kwargs):
+            con = proxy._client.connect()
+            try:
+                proto = con.get_protocol({proxy._svc_name: proxy._commands})
+
+                return proto.send_cmd(proxy._svc_name, cmd_name,
+                    *args, **_coerce_kwargs(kwargs))
+            except errors.TransportError:
+                proxy._client.close()
+                raise
+
+        retry_wrap = lambda *a, **k: proxy._retry.call(call_value, *a, **k)
 
-    if not cmd_def:
-        return retry_wrap
     return utils.function.dict_to_func(cmd_def, retry_wrap)
 
 class StreamInitiator(object):
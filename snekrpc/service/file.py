@@ -1,9 +1,10 @@
 import io
 import os
-import glob
 import shutil
 import contextlib
 
+from .. import glob
+
 from .. import logs
 from .. import utils
 from .. import Service, command, param
@@ -40,7 +41,7 @@ class FileService(Service):
         # startswith(root_path) check
         self._root_path = os.path.join(path, '')
 
-    @command(with_metadata='bool')
+    @command(batch_bytes=4096, with_metadata='bool')
     def paths(self, pattern=None, with_metadata=False):
         """Iterates over path names matching the recursive glob *pattern*.
 
@@ -139,8 +140,9 @@ class FileService(Service):
         path = self.check_path(dst_path)
 
         with open(path, 'wb') as fp:
-            for chunk in src:
-                fp.write(chunk)
+            # writelines drives the chunk iterator from C, without a
+            # bytecode loop per chunk
+            fp.writelines(src)
 
             # ensure data is written to disk
             fp.flush()
@@ -158,9 +160,18 @@ class FileService(Service):
         # check access to the file
         path = self.check_path(src_path)
 
+        # a single reused buffer avoids allocating a fresh bytes object per
+        # chunk. this is safe because the protocol encodes each chunk
+        # before requesting the next one.
+        buf = bytearray(self.chunk_size)
+        view = memoryview(buf)
+
         with open(path, 'rb') as fp:
-            for chunk in utils.path.iter_file(fp, self.chunk_size):
-                yield chunk
+            while True:
+                n = fp.readinto(buf)
+                if not n:
+                    break
+                yield view[:n]
 
             log.info('%s bytes downloaded: %s', fp.tell(), path)
 
@@ -9,7 +9,15 @@ class HealthService(Service):
 
     @command()
     def ping(self, count=1, interval=1.0):
-        it = range(count-1) if count > 0 else itertools.count()
+        if count > 0:
+            # the default liveness probe; skip building an iterator
+            if count == 1:
+                return
+            it = range(count-1)
+        else:
+            it = itertools.count()
+
+        sleep = time.sleep
         for _ in it:
             yield
-            time.sleep(interval)
+            sleep(interval)
@@ -12,25 +12,45 @@ class MetadataService(Service):
     @param('server', hide=True)
     def __init__(self, server):
         self._server = server
+        # built payloads, cached against the server's service version so
+        # that add_service/remove_service invalidate them
+        self._cache = {}
+        self._version = None
+
+    def _cached(self, key, build):
+        version = self._server._services_version
+        if version != self._version:
+            self._cache.clear()
+            self._version = version
+        try:
+            return self._cache[key]
+        except KeyError:
+            res = self._cache[key] = build()
+            return res
 
     @command()
     def status(self):
-        ifc = self._server
-        res = {
-            'codec': ifc.codec._name_,
-            'transport': ifc.transport._name_,
-            'version': ifc.version,
-            }
-        return to_unicode(res)
+        def build():
+            ifc = self._server
+            return to_unicode({
+                'codec': ifc.codec._name_,
+                'transport': ifc.transport._name_,
+                'version': ifc.version,
+                })
+        return self._cached('status', build)
 
     @command()
     def service_names(self):
-        return self._server.service_names()
+        # a shared tuple: immutable, so no per-request list copy
+        return self._cached('service_names',
+            lambda: tuple(self._server.service_names()))
 
     @command()
     def services(self):
-        return to_unicode([s2d(svc) for svc in self._server.services()])
+        return self._cached('services', lambda: to_unicode(
+            [s2d(svc) for svc in self._server.services()]))
 
     @command()
     def service(self, name):
-        return to_unicode(s2d(self._server.service(name)))
+        return self._cached(('service', name), lambda: to_unicode(
+            s2d(self._server.service(name))))
@@ -30,24 +30,37 @@ def set_color_enabled(enabled=True):
     global _enable_color
     _enable_color = enabled
 
+# escape lookups built once at import. color() can run per table cell,
+# so it should not pay for getattr/upper() on each call
+if colorama:
+    _FORE = {k.lower(): v for k, v in vars(Fore).items()
+        if not k.startswith('_')}
+    _BACK = {k.lower(): v for k, v in vars(Back).items()
+        if not k.startswith('_')}
+    _STYLE = {k.lower(): v for k, v in vars(Style).items()
+        if not k.startswith('_')}
+    _RESET = Style.RESET_ALL
+else:
+    _FORE = _BACK = _STYLE = {}
+    _RESET = ''
+
 def color(s, fore=None, back=None, style=None):
-    if _enable_color and colorama:
-        fore = getattr(Fore, fore.upper()) if fore else ''
-        back = getattr(Back, back.upper()) if back else ''
-        style = getattr(Style, style.upper()) if style else ''
-        reset = Style.RESET_ALL
-    else:
-        fore, back, style, reset = [''] * 4
-    return '{fore}{back}{style}{s}{reset}'.format(
-        fore=fore, back=back, style=style, s=s, reset=reset)
+    if not (_enable_color and colorama):
+        return '{}'.format(s)
+    fore = _FORE.get(fore.lower(), '') if fore else ''
+    back = _BACK.get(back.lower(), '') if back else ''
+    style = _STYLE.get(style.lower(), '') if style else ''
+    return '{}{}{}{}{}'.format(fore, back, style, s, _RESET)
 
 ##
 ## text alignment
 ##
 
+_ALIGN = {'left': '<', 'center': '^', 'right': '>'}
+
 def align(s, width, alignment='left'):
     try:
-        alignment = {'left': '<', 'center': '^', 'right': '>'}[alignment]
+        alignment = _ALIGN[alignment]
     except KeyError:
         raise ValueError('invalid alignment: {}'.format(alignment))
     return '{:{}{}}'.format(s, alignment, width)
@@ -57,7 +70,7 @@ def elide(s, width=None, align='right', ellipsis='…'):
 
     Defaults to terminal width.
     """
-    width = width or get_terminal_size().columns
+    width = width or _get_width()
     if len(s) <= width: return s
 
     l = len(ellipsis)
@@ -66,9 +79,11 @@ def elide(s, width=None, align='right', ellipsis='…'):
     elif align == 'left':
         return ellipsis + s[-width+l:]
     elif align == 'center':
-        w_2 = width / 2
-        l_2 = l / 2
-        return s[:math.ceil(w_2)-math.ceil(l_2)] + ellipsis + s[-math.floor(w_2)+math.floor(l_2):]
+        # integer halves (ceil for the head, floor for the tail); no
+        # float math or math.* calls per row
+        head = (width + 1) // 2 - (l + 1) // 2
+        tail = width // 2 - l // 2
+        return s[:head] + ellipsis + s[-tail:]
     else:
         raise ValueError('invalid alignment choice: {}'.format(align))
 
@@ -76,17 +91,28 @@ def elide(s, width=None, align='right', ellipsis='…'):
 ## date/time
 ##
 
-# from: http://stackoverflow.com/a/13287083
+try:
+    _UTC = datetime.timezone.utc
+except AttributeError: # python 2
+    _UTC = None
+
+_LOCALTIME_FMT = '%Y-%m-%d %H:%M:%S'
+
 def utc_to_local(utc_dt):
     """Convert a UTC datetime object to local time."""
+    if _UTC is not None:
+        # a single C-level conversion, instead of the timetuple round
+        # trip below
+        return utc_dt.replace(tzinfo=_UTC).astimezone().replace(tzinfo=None)
+
+    # from: http://stackoverflow.com/a/13287083
     # get integer timestamp to avoid precision lost
     timestamp = calendar.timegm(utc_dt.timetuple())
     local_dt = datetime.datetime.fromtimestamp(timestamp)
-    assert utc_dt.resolution >= datetime.timedelta(microseconds=1)
     return local_dt.replace(microsecond=utc_dt.microsecond)
 
 def to_formatted_localtime(dt):
-    return utc_to_local(dt).strftime('%Y-%m-%d %H:%M:%S')
+    return utc_to_local(dt).strftime(_LOCALTIME_FMT)
 
 ##
 ## terminal
@@ -183,3 +209,54 @@ except ImportError:
                 lines = size.lines
 
         return terminal_size(columns, lines)
+
+# the ioctl behind get_terminal_size() is a syscall per call, which adds
+# up when eliding every cell of a table. the width is cached and
+# invalidated on SIGWINCH. if no handler can be installed (no SIGWINCH,
+# not the main thread, or a non-chainable handler already in the slot)
+# every call falls through to the syscall
+_signal = None
+_term_width = None
+_watching_resize = None # None until the first _get_width()
+_prev_handler = None
+
+def _invalidate_width(signum=None, frame=None):
+    global _term_width
+    _term_width = None
+    if _prev_handler is not None:
+        _prev_handler(signum, frame)
+
+def _watch_resize():
+    """Internal. Installs the SIGWINCH handler on first use, chaining any
+    handler the application installed before us."""
+    global _signal, _watching_resize, _prev_handler
+    try:
+        import signal
+        prev = signal.getsignal(signal.SIGWINCH)
+        if prev is None:
+            # a handler not set from Python (e.g. by an extension);
+            # it cannot be chained, so leave the slot alone
+            _watching_resize = False
+            return
+        signal.signal(signal.SIGWINCH, _invalidate_width)
+    except (ImportError, AttributeError, ValueError, OSError):
+        _watching_resize = False
+        return
+    _signal = signal
+    _prev_handler = prev if callable(prev) else None
+    _watching_resize = True
+
+def _get_width():
+    global _term_width, _watching_resize
+    if _watching_resize is None:
+        _watch_resize()
+    if _watching_resize:
+        # the application may have replaced our handler since; a width
+        # nothing invalidates must not be trusted
+        if _signal.getsignal(_signal.SIGWINCH) is _invalidate_width:
+            width = _term_width
+            if width is None:
+                width = _term_width = get_terminal_size().columns
+            return width
+        _watching_resize = False
+    return get_terminal_size().columns
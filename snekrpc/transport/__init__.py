@@ -11,13 +11,24 @@ TransportMeta = registry.create_metaclass(__name__)
 
 log = logs.get(__name__)
 
+# precompiled op header for the handshake. building '>B{}s' format
+# strings per message would re-parse the format on every call
+_OP = struct.Struct('>B')
+
+# resolved classes, cached to skip the registry lookup (the same
+# pattern as codec.get)
+_cls_cache = {}
+
 def get(url, transport_args=None):
     """Returns an instance of the Transport matching the schema of *url*."""
     if isinstance(url, Transport):
         return url
 
     scheme = utils.url.Url(url).scheme
-    cls = TransportMeta.get(scheme)
+    try:
+        cls = _cls_cache[scheme]
+    except KeyError:
+        cls = _cls_cache[scheme] = TransportMeta.get(scheme)
     if isinstance(cls, Exception):
         raise cls
     return cls(url, **(transport_args or {}))
@@ -43,6 +54,10 @@ class Transport(utils.compat.with_metaclass(TransportMeta, object)):
         raise NotImplementedError('abstract')
 
 class Message(object):
+    # one Message is allocated per received frame, so skip the instance
+    # __dict__ and keep attribute access a fixed-slot read
+    __slots__ = ('op', 'data')
+
     def __init__(self, op, data=None):
         self.op = op
         self.data = data
@@ -60,6 +75,14 @@ class Connection(object):
         self._addr = addr
         self._proto = protocol.Protocol(interface, self)
 
+        # cached per connection (see Protocol.__init__)
+        self._debug = log.isEnabledFor(logs.DEBUG)
+
+        # codec entry points, bound once negotiation settles so the
+        # per-message paths skip the handshake checks
+        self._encode = None
+        self._decode = None
+
     @property
     def url(self):
         return self._addr
@@ -83,18 +106,19 @@ class Connection(object):
         if self._ifc.codec:
             return
 
-        if log.isEnabledFor(logs.DEBUG):
+        debug = self._debug
+        if debug:
             log.debug('msg: %s -> %s', Message(Op.handshake, None), self._addr)
 
-        buf = struct.pack('>B', Op.handshake)
-        self.send(buf)
+        self.send(_OP.pack(Op.handshake))
 
         buf = self.recv()
-        op, codec = struct.unpack('>B{}s'.format(len(buf) - 1), buf)
+        op = _OP.unpack_from(buf)[0]
+        codec = buf[1:]
         if op != Op.handshake:
             raise errors.ProtocolOpError(op)
 
-        if log.isEnabledFor(logs.DEBUG):
+        if debug:
             log.debug('msg: %s <- %s', Message(op, codec), self._addr)
 
         self._ifc.codec = codec.decode('utf8')
@@ -103,46 +127,68 @@ class Connection(object):
         if data != b'\x00': # bit of a shortcut. skip conversion to Op.handshake
             return data
 
-        if log.isEnabledFor(logs.DEBUG):
+        debug = self._debug
+        if debug:
             log.debug('msg: %s <- %s', Message(Op.handshake, None), self._addr)
 
-        name = self._ifc.codec._name_.encode('utf8')
+        codec = self._ifc.codec
+        try:
+            # the reply depends only on the codec, so servers facing
+            # many short-lived connections build it once
+            reply = codec._handshake_reply
+        except AttributeError:
+            reply = codec._handshake_reply = (
+                _OP.pack(Op.handshake) + codec._name_bytes_)
 
-        if log.isEnabledFor(logs.DEBUG):
-            log.debug('msg: %s -> %s', Message(Op.handshake, name), self._addr)
+        if debug:
+            log.debug('msg: %s -> %s',
+                Message(Op.handshake, reply[1:]), self._addr)
 
-        buf = struct.pack('>B{}s'.format(len(name)), Op.handshake, name)
-        self.send(buf)
+        self.send(reply)
 
         # continue with standard protocol
         return self.recv()
 
+    def _bind_codec(self):
+        codec = self._ifc.codec
+        self._encode = codec._encode
+        self._decode = codec._decode
+
     ## message protocol ##
 
     def recv_msg(self):
         data = self.recv()
-        # check for handshake
-        data = self.res_handshake(data)
 
-        if not data:
+        decode = self._decode
+        if decode is None:
+            # check for handshake
+            data = self.res_handshake(data)
+            if not data:
+                return None
+            self._bind_codec()
+            decode = self._decode
+        elif not data:
             return None
 
-        msg = Message(*self._ifc.codec._decode(data))
+        msg = Message(*decode(data))
 
-        if log.isEnabledFor(logs.DEBUG):
+        if self._debug:
             log.debug('msg: %s <- %s', msg, self._addr)
 
         return msg
 
     def send_msg(self, op, data=None):
-        # check for handshake
-        self.req_handshake()
-
-        if log.isEnabledFor(logs.DEBUG):
+        encode = self._encode
+        if encode is None:
+            # check for handshake
+            self.req_handshake()
+            self._bind_codec()
+            encode = self._encode
+
+        if self._debug:
             log.debug('msg: %s -> %s', Message(op, data), self._addr)
 
-        msg = self._ifc.codec._encode((op, data))
-        return self.send(msg)
+        return self.send(encode((op, data)))
 
     ## management ##
 
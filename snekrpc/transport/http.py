@@ -15,6 +15,7 @@ from .. import param
 from .. import __version__
 
 from . import Connection, Transport
+from .tcp import sendmsg_all
 
 SERVER_NAME = 'snekrpc'
 
@@ -24,11 +25,19 @@ log = logs.get(__name__)
 class HTTPHandler(server.BaseHTTPRequestHandler, object):
     protocol_version = 'HTTP/1.1'
 
+    # buffer the response stream. the handler default is unbuffered,
+    # which costs a syscall per chunked frame when streaming
+    wbufsize = -1
+
+    def setup(self):
+        super(HTTPHandler, self).setup()
+        # formatted once per connection; log_request runs per request
+        self._addr_str = utils.url.format_addr(self.client_address)
+
     def do_POST(self):
         # handle command
         ifc = self.server._interface
-        con = HTTPServerConnection(
-            ifc, utils.url.format_addr(self.client_address), self)
+        con = HTTPServerConnection(ifc, self._addr_str, self)
         with con:
             while not con.should_close:
                 ifc.handle(con)
@@ -41,18 +50,21 @@ class HTTPHandler(server.BaseHTTPRequestHandler, object):
         self.send_header('Content-Type', 'application/octet-stream')
         self.send_header('Transfer-Encoding', 'chunked')
 
-        # user headers
-        for k, v in self.server._headers.items():
-            self.send_header(k, v)
+        # user headers, pre-encoded at server construction
+        blob = self.server._header_blob
+        if blob:
+            try:
+                self._headers_buffer.append(blob)
+            except AttributeError: # py2 writes headers unbuffered
+                self.wfile.write(blob)
         self.end_headers()
 
     def version_string(self):
-        return self.server._version or '{}/{} {}'.format(SERVER_NAME,
-            __version__, self.server._interface.version or '').strip()
+        return self.server._version
 
     def log_request(self, code='-', size='-'):
-        url = utils.url.format_addr(self.client_address)
-        log.debug('%r %s <- %s', self.requestline, code, url)
+        # lazy %-formatting: no work is done unless debug is enabled
+        log.debug('%r %s <- %s', self.requestline, code, self._addr_str)
 
 class HTTPTransport(Transport):
     _name_ = 'http'
@@ -71,10 +83,8 @@ class HTTPTransport(Transport):
         return HTTPClientConnection(client, utils.url.format_addr(self._addr))
 
     def serve(self, server):
-        self._server = ThreadingHTTPServer(self._addr, self.Handler)
-        self._server._headers = self.headers or {}
-        self._server._version = self.version
-        self._server._interface = server
+        self._server = ThreadingHTTPServer(self._addr, self.Handler,
+            server, headers=self.headers, version=self.version)
 
         log.info('listening: %s', self.url)
         # XXX: expose poll_interval for config?
@@ -93,6 +103,18 @@ class HTTPTransport(Transport):
 class ThreadingHTTPServer(socketserver.ThreadingMixIn, server.HTTPServer):
     daemon_threads = True
 
+    def __init__(self, addr, handler, interface, headers=None, version=None):
+        server.HTTPServer.__init__(self, addr, handler)
+        self._interface = interface
+        # computed once: version_string runs on every response
+        self._version = version or '{}/{} {}'.format(
+            SERVER_NAME, __version__, interface.version or '').strip()
+        # user headers encoded once, instead of a send_header loop per
+        # response
+        self._header_blob = b''.join(
+            '{}: {}\r\n'.format(k, v).encode('latin-1')
+            for k, v in (headers or {}).items())
+
     def handle_error(self, request, client_address):
         log.exception('request error (%s)', utils.url.format_addr(client_address))
 
@@ -123,18 +145,33 @@ class HTTPClientConnection(Connection):
         rfile = self._res.fp
 
         line = rfile.readline()
-        chunk_len = int(line[:-2], 16)
+        # int() ignores the trailing CRLF as whitespace, so the hex
+        # parse needs no slice copy per chunk
+        chunk_len = int(line, 16)
 
         # +2 for the trailing newline (not included in chunk_len)
         return rfile.read(chunk_len + 2)[:-2]
 
     def send(self, data):
-        con = self._con
-
-        con.send('{:X}\r\n'.format(len(data)).encode('ascii'))
-        con.send(data + b'\r\n')
+        header = '{:X}\r\n'.format(len(data)).encode('ascii')
+        sock = self._con.sock
+        try:
+            sendmsg = sock.sendmsg
+        except AttributeError:
+            # one buffer, one write: the header and trailer would
+            # otherwise go out as separate tiny segments
+            self._con.send(header + data + b'\r\n')
+            return
+        # gather header, payload, and trailer into one syscall without
+        # copying the payload
+        sendmsg_all(sendmsg,
+            [memoryview(header), memoryview(data), memoryview(b'\r\n')])
 
     def close(self):
+        # the chunked request/response streams only terminate when the
+        # connection does, so the socket cannot be pooled for reuse.
+        # release it promptly instead of waiting for the GC
+        self._con.close()
         log.debug('disconnected: %s', self.url)
 
 class HTTPServerConnection(Connection):
@@ -148,13 +185,18 @@ class HTTPServerConnection(Connection):
         log.debug('connected: %s', self.url)
 
     def recv(self):
+        # the peer waits on our buffered replies before it sends more,
+        # so drain them before blocking on input. a no-op when nothing
+        # is pending
+        self.handler.wfile.flush()
+
         rfile = self.handler.rfile
 
         line = rfile.readline()
         if not line:
             self.should_close = True
             return None
-        chunk_len = int(line[:-2], 16)
+        chunk_len = int(line, 16) # see HTTPClientConnection.recv
 
         # +2 for the trailing newline (not included in chunk_len)
         return rfile.read(chunk_len + 2)[:-2]
@@ -164,11 +206,9 @@ class HTTPServerConnection(Connection):
             self.handler.start_response()
             self.response_started = True
 
-        wfile = self.handler.wfile
-
-        # send chunked
-        wfile.write('{:X}\r\n'.format(len(data)).encode('ascii'))
-        wfile.write(data + b'\r\n')
+        # send chunked, as a single write (see HTTPClientConnection.send)
+        self.handler.wfile.write(
+            '{:X}\r\n'.format(len(data)).encode('ascii') + data + b'\r\n')
 
     def close(self):
         self.handler.wfile.flush()
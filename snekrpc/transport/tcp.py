@@ -1,12 +1,18 @@
 from __future__ import absolute_import
 
-import io
+import os
 import ssl
 import errno
+import select
 import socket
 import struct
 import threading
 
+try:
+    import queue
+except ImportError: # python 2
+    import Queue as queue
+
 from .. import logs
 from .. import utils
 from .. import errors
@@ -15,11 +21,62 @@ from .. import param
 from . import Connection, Transport
 
 BACKLOG = socket.SOMAXCONN
-CHUNK_SIZE = io.DEFAULT_BUFFER_SIZE
+# io.DEFAULT_BUFFER_SIZE (8 KiB) forces many read iterations for bulk
+# payloads; 64 KiB keeps small-message latency unchanged while cutting
+# syscalls for large transfers
+CHUNK_SIZE = 64 * 1024
 ACCEPT_TIMEOUT = 0.1
+WORKERS = min(32, (getattr(os, 'cpu_count', lambda: None)() or 1) * 4)
+
+# precompiled length prefix, re-parsing '>I' per message adds up
+_U32 = struct.Struct('>I')
 
 log = logs.get(__name__)
 
+class _HandlerPool(object):
+    """A pool of reusable handler threads.
+
+    Up to *workers* threads are kept warm between connections; beyond
+    that, threads are still started on demand (a connection can be held
+    open indefinitely, so admission is never blocked) but exit once
+    their connection closes. Daemon threads (`utils.start_thread`) are
+    used so idle handlers never keep a stopped server process alive.
+    """
+    def __init__(self, workers):
+        self._workers = workers
+        self._count = 0
+        self._idle = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+
+    def submit(self, func, *args):
+        with self._lock:
+            if self._idle:
+                # reserve an idle worker
+                self._idle -= 1
+                spawn = False
+            else:
+                self._count += 1
+                spawn = True
+        if spawn:
+            utils.start_thread(self._work)
+        self._queue.put((func, args))
+
+    def _work(self):
+        q = self._queue
+        while True:
+            func, args = q.get()
+            try:
+                func(*args)
+            except Exception:
+                log.exception('handler error')
+            with self._lock:
+                if self._count > self._workers:
+                    # shed threads beyond the warm pool size
+                    self._count -= 1
+                    return
+                self._idle += 1
+
 class TcpConnection(Connection):
     log = log
 
@@ -27,10 +84,16 @@ class TcpConnection(Connection):
         super(TcpConnection, self).__init__(interface, url)
         self._sock = sock
         self._chunk_size = chunk_size
-        self.log.debug('connected: %s', self.url)
+        # a buffered reader usually satisfies the 4-byte length prefix
+        # (and small payloads) without a dedicated syscall per read
+        self._rfile = sock.makefile('rb', chunk_size or CHUNK_SIZE)
+        # reuse the cached flag (see Connection.__init__): even a no-op
+        # log call costs a frame per connection
+        if self._debug:
+            self.log.debug('connected: %s', self.url)
 
     def recv(self):
-        return recv(self._sock, self._chunk_size)
+        return recv_file(self._rfile)
 
     def send(self, data):
         try:
@@ -39,8 +102,13 @@ class TcpConnection(Connection):
             raise errors.TransportError(e)
 
     def close(self):
+        try:
+            self._rfile.close()
+        except (OSError, socket.error):
+            pass
         close(self._sock)
-        self.log.debug('disconnected: %s', self.url)
+        if self._debug:
+            self.log.debug('disconnected: %s', self.url)
 
 class TcpTransport(Transport):
     _name_ = 'tcp'
@@ -49,9 +117,18 @@ class TcpTransport(Transport):
 
     @param('backlog', int, default=BACKLOG)
     @param('chunk_size', int, default=CHUNK_SIZE)
+    @param('workers', int, default=WORKERS,
+        doc='handler threads kept warm between connections')
     @param('ssl_key', doc='server-side only')
+    @param('tcp_nodelay', bool, default=True,
+        doc='disable Nagle coalescing for latency-sensitive messages')
+    @param('so_sndbuf', int, doc='socket send buffer size')
+    @param('so_rcvbuf', int, doc='socket receive buffer size')
+    @param('so_reuseport', bool,
+        doc='balance connections across processes bound to the same port')
     def __init__(self, url, timeout=None, backlog=None, chunk_size=None,
-            ssl_cert=None, ssl_key=None):
+            workers=None, ssl_cert=None, ssl_key=None, tcp_nodelay=True,
+            so_sndbuf=None, so_rcvbuf=None, so_reuseport=False):
         super(TcpTransport, self).__init__(url)
         url = self._url
 
@@ -61,21 +138,40 @@ class TcpTransport(Transport):
         self.timeout = timeout
         self.backlog = backlog or BACKLOG
         self.chunk_size = chunk_size
+        self.workers = workers or WORKERS
+
+        self.tcp_nodelay = tcp_nodelay
+        self.so_sndbuf = so_sndbuf
+        self.so_rcvbuf = so_rcvbuf
+        self.so_reuseport = so_reuseport
 
         self._ssl_cert = ssl_cert
         self._ssl_key = ssl_key
 
         self._stop = threading.Event()
         self._stopped = threading.Event()
+        self._wake = None
+        self._pool = None
+
+    def _setopts(self, sock):
+        if self.tcp_nodelay:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.so_sndbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.so_sndbuf)
+        if self.so_rcvbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.so_rcvbuf)
 
     def connect(self, client):
         s = socket.create_connection(self._addr, self.timeout)
+        self._setopts(s)
 
         if self._ssl_cert:
             ctx = ssl.create_default_context()
             ctx.load_verify_locations(self._ssl_cert)
-            hostname = socket.gethostbyaddr(self._addr[0])[0]
-            s = ctx.wrap_socket(s, server_hostname=hostname)
+            # use the host the caller supplied for SNI instead of a
+            # blocking reverse-DNS round trip per connection. connect
+            # by name for certificate validation to succeed
+            s = ctx.wrap_socket(s, server_hostname=self._url.host)
 
         return self.Connection(client, s, self._url.netloc, self.chunk_size)
 
@@ -83,6 +179,8 @@ class TcpTransport(Transport):
         self._sock = s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         s.settimeout(ACCEPT_TIMEOUT)
         s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.so_reuseport and hasattr(socket, 'SO_REUSEPORT'):
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
         s.bind(self._addr)
         s.listen(self.backlog)
 
@@ -102,13 +200,30 @@ class TcpTransport(Transport):
         stop.clear()
         stopped.clear()
 
+        # a bounded pool reuses handler threads instead of paying
+        # create/teardown per connection. created once per transport so
+        # stop()/serve() cycles don't strand the previous pool's workers
+        if self._pool is None:
+            self._pool = _HandlerPool(self.workers)
+        submit = self._pool.submit
+
+        # stop() writes to a socketpair so the loop can block in select
+        # indefinitely instead of waking on an accept timeout to poll
+        # for shutdown
+        wake_r, wake_w = socket.socketpair()
+        self._wake = wake_w
+
         try:
             while not stop.is_set():
+                ready = select.select([s, wake_r], [], [])[0]
+                if wake_r in ready:
+                    break
                 try:
                     sock, addr = s.accept()
                 except socket.timeout:
                     continue
                 sock.settimeout(self.timeout)
+                self._setopts(sock)
 
                 try:
                     if ctx:
@@ -117,8 +232,11 @@ class TcpTransport(Transport):
                     log.exception('ssl error')
                     continue
 
-                utils.start_thread(self.handle, server, sock, addr)
+                submit(self.handle, server, sock, addr)
         finally:
+            self._wake = None
+            wake_r.close()
+            wake_w.close()
             stopped.set()
 
     def handle(self, server, sock, addr):
@@ -128,6 +246,12 @@ class TcpTransport(Transport):
 
     def stop(self):
         self._stop.set()
+        wake = self._wake
+        if wake:
+            try:
+                wake.send(b'\x00')
+            except (OSError, socket.error):
+                pass # serve already exited
 
     def join(self, timeout=None):
         self._stopped.wait(timeout)
@@ -145,44 +269,43 @@ def close(sock):
             raise
     sock.close()
 
-def recv(sock, chunk_size=None):
-    """Receives a block of data from the socket."""
-    try:
-        return b''.join(recviter(sock, chunk_size))
-    except errors.ReceiveInterrupted:
-        return b''
-
-def recviter(sock, chunk_size=None):
-    """Returns an iterator over the data received from the socket.
-
-    Each chunk of data yielded will be equal to or less than
-    *chunk_size*.
+def recv_file(rfile):
+    """Receives a block of data from a buffered socket reader.
 
-    Can raise a `ReceiveInterrupted` exception.
+    `read()` on a buffered reader returns the full requested size (or
+    EOF), so no reassembly loop is needed. Large payloads bypass the
+    buffer and are read into a single allocation.
     """
-    buf = b''.join(recvsize(sock, 4, chunk_size))
-    data_len = struct.unpack('>I', buf)[0]
-    for chunk in recvsize(sock, data_len, chunk_size):
-        yield chunk
-
-def recvsize(sock, size, chunk_size=None):
-    """Returns an iterator over the chunks received from the socket.
+    header = rfile.read(4)
+    if len(header) < 4:
+        # interrupted
+        return b''
+    data_len = _U32.unpack_from(header)[0]
 
-    If the socket stops receiving data before *size* bytes have been read, a
-    `ReceiveInterrupted` exception will be raised.
-    """
-    pos = 0
-    chunk_size = min(size, chunk_size or CHUNK_SIZE)
-    while pos < size:
-        chunk = sock.recv(min(size-pos, chunk_size))
-        if not chunk:
-            raise errors.ReceiveInterrupted()
-        pos += len(chunk)
-        yield chunk
+    data = rfile.read(data_len)
+    if len(data) < data_len:
+        return b''
+    return data
 
 def send(sock, data):
     """Sends *data* over the socket."""
-    data_len = len(data)
-    size = struct.pack('>I', data_len)
-    sock.sendall(size)
-    sock.sendall(data)
+    size = _U32.pack(len(data))
+    # ssl sockets define sendmsg only to raise NotImplementedError, so
+    # they (like platforms without sendmsg) pay the concatenation copy
+    if isinstance(sock, ssl.SSLSocket) or not hasattr(sock, 'sendmsg'):
+        sock.sendall(size + data)
+        return
+
+    # gather the length prefix and payload into one syscall without
+    # concatenating them first
+    sendmsg_all(sock.sendmsg, [memoryview(size), memoryview(data)])
+
+def sendmsg_all(sendmsg, bufs):
+    """Gathers *bufs* into *sendmsg* calls until every byte is sent."""
+    while bufs:
+        sent = sendmsg(bufs)
+        while bufs and sent >= len(bufs[0]):
+            sent -= len(bufs[0])
+            del bufs[0]
+        if sent:
+            bufs[0] = bufs[0][sent:]
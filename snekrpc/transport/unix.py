@@ -26,6 +26,10 @@ class UnixTransport(tcp.TcpTransport):
         super(UnixTransport, self).__init__(url, timeout, backlog, chunk_size)
         self._path = self._url.path
 
+    def _setopts(self, sock):
+        # TCP socket options do not apply to unix sockets
+        pass
+
     def connect(self, client):
         self._sock = s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         s.settimeout(self.timeout)
@@ -4,6 +4,8 @@ import sys
 PY3 = sys.version_info.major >= 3
 # use str for unicode data and bytes for binary data
 str = str if PY3 else unicode
+# intern moved to sys in py3
+intern = sys.intern if PY3 else intern
 
 def is_fileobject(o):
     return isinstance(o, io.IOBase if PY3 else file)
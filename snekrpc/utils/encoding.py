@@ -5,7 +5,56 @@ except ImportError:
 
 from .compat import str, viewitems
 
+def _bytes_clean(s):
+    """Returns `True` when to_bytes(s) would rebuild *s* unchanged."""
+    t = type(s)
+    if t is bytes or t is int or t is float or t is bool or s is None:
+        return True
+    if t is dict:
+        return all(_bytes_clean(k) and _bytes_clean(v)
+            for k, v in viewitems(s))
+    if t is list or t is tuple:
+        return all(_bytes_clean(x) for x in s)
+    return False
+
+def _unicode_clean(s):
+    """Returns `True` when to_unicode(s) would rebuild *s* unchanged."""
+    t = type(s)
+    if t is str or t is int or t is float or t is bool or s is None:
+        return True
+    if t is dict:
+        return all(_unicode_clean(k) and _unicode_clean(v)
+            for k, v in viewitems(s))
+    if t is list or t is tuple:
+        return all(_unicode_clean(x) for x in s)
+    return False
+
 def to_bytes(s, encoding='utf8'):
+    # most payloads have nothing to convert. an early-exit scan is far
+    # cheaper than rebuilding the container tree, and the guard applies
+    # per subtree, so only dirty branches are rebuilt
+    if _bytes_clean(s):
+        return s
+    # identity checks on the exact builtin types cover nearly every
+    # value that passes through here, in one cheap comparison each.
+    # subclasses and other iterables fall through to the isinstance
+    # chain below
+    t = type(s)
+    if t is bytes:
+        return s
+    if t is str:
+        return s.encode(encoding)
+    if t is dict:
+        return {to_bytes(k, encoding): to_bytes(v, encoding)
+            for k, v in viewitems(s)}
+    # preserve the container type: both encode identically on the wire
+    if t is list:
+        return [to_bytes(x, encoding) for x in s]
+    if t is tuple:
+        return tuple(to_bytes(x, encoding) for x in s)
+    return _to_bytes_other(s, encoding)
+
+def _to_bytes_other(s, encoding):
     if isinstance(s, bytes):
         pass
     elif isinstance(s, str):
@@ -25,6 +74,27 @@ def to_unicode(s, encoding='utf8', dict_keys_only=False):
     If *dict_keys_only* is `True`, only the keys of a dict will be decoded.
     Values will remain untouched.
     """
+    if _unicode_clean(s):
+        return s
+
+    # see to_bytes for the dispatch pattern
+    t = type(s)
+    if t is str:
+        return s
+    if t is bytes:
+        return s.decode(encoding)
+    if t is dict:
+        return {to_unicode(k, encoding):
+            v if dict_keys_only else to_unicode(v, encoding)
+            for k, v in viewitems(s)}
+    # preserve the container type (see to_bytes)
+    if t is list:
+        return [to_unicode(x, encoding) for x in s]
+    if t is tuple:
+        return tuple(to_unicode(x, encoding) for x in s)
+    return _to_unicode_other(s, encoding, dict_keys_only)
+
+def _to_unicode_other(s, encoding, dict_keys_only):
     if isinstance(s, bytes):
         s = s.decode(encoding)
     elif isinstance(s, str):
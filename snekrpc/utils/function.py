@@ -1,7 +1,7 @@
 import re
-import copy
 import inspect
 import keyword
+import weakref
 import tokenize
 import collections
 
@@ -20,11 +20,16 @@ from .encoding import to_unicode, to_bytes
 _rx_ident = re.compile(r'^{}$'.format(tokenize.Name))
 def is_identifier(s):
     try:
-        return s.isidentifier()
+        # C-level check; the regex is only the py2 fallback
+        if not s.isidentifier():
+            return False
     except AttributeError:
-        return bool(_rx_ident.match(s)) and not keyword.iskeyword(s)
+        if not _rx_ident.match(s):
+            return False
+    # keywords pass isidentifier() but would break the exec'd stubs
+    return not keyword.iskeyword(s)
 
-def command(**hints):
+def command(batch_bytes=None, **hints):
     """Decorator that identifies a function to expose as an RPC command.
 
     *hints* can be used to set type hints for arguments accepted by the
@@ -33,10 +38,15 @@ def command(**hints):
     hint should indicate to a client developer the type of value that is
     expected. Use of standard Python types is recommended.
 
+    *batch_bytes* can be set on generator commands to send streamed values
+    in batches of roughly that size (see `Protocol.send_stream`).
+
     To provide more parameter metadata, use the `@param()` decorator.
     """
     def decorator(func):
         cmd_meta = func.__dict__.setdefault('_meta', {})
+        if batch_bytes:
+            cmd_meta['batch_bytes'] = batch_bytes
         params = cmd_meta.setdefault('params', {})
         for name, hint in hints.items():
             hintstr = _hint_to_str(hint)
@@ -83,33 +93,78 @@ def param(name, hint=None, doc=None, hide=False, **metadata):
         return func
     return decorator
 
+# the common builtin hints, mapped straight to their wire names
+_HINT_NAMES = {
+    None: u'str',
+    str: u'str' if compat.PY3 else u'bytes',
+    bytes: u'bytes',
+    int: u'int',
+    float: u'float',
+    bool: u'bool',
+    list: u'list',
+    dict: u'dict',
+    }
+
 def _hint_to_str(hint):
     """Internal. Converts type hints to strings."""
+    try:
+        return _HINT_NAMES[hint]
+    except (KeyError, TypeError):
+        pass
+
     if not hint:
         name = 'str'
     elif isinstance(hint, (compat.str, bytes)):
         name = hint
     else:
         name = hint.__name__
-        if name == 'str':
-            name = 'str' if compat.PY3 else 'bytes'
-        elif name == 'unicode':
+        if name == 'unicode':
             name = 'str'
+    if type(name) is compat.str:
+        return name
     return to_unicode(name)
 
+# signature() dominates the cost of building command metadata, and the
+# result only depends on the function itself, so build once per
+# (function, remove_self). weak keys let unloaded functions drop out
+_f2d_cache = weakref.WeakKeyDictionary()
+
 def func_to_dict(func, remove_self=False):
     """Returns metadata for *func* in a dict.
 
     If *remove_self* is `True` ...
     """
+    # bound methods are recreated per attribute access; key the cache
+    # on the underlying function
+    base = getattr(func, '__func__', func)
+    try:
+        d = _f2d_cache[base][remove_self]
+    except (KeyError, TypeError):
+        d = _func_to_dict(func, remove_self)
+        try:
+            _f2d_cache.setdefault(base, {})[remove_self] = d
+        except TypeError:
+            pass # not weak-referenceable
+    # callers mutate the result (see cli), so hand out copies. only the
+    # dicts themselves are touched, so a targeted shallow clone avoids
+    # deepcopy's full graph recursion
+    d = dict(d)
+    d['params'] = [dict(p) for p in d['params']]
+    if 'meta' in d:
+        d['meta'] = dict(d['meta'])
+    return d
+
+def _func_to_dict(func, remove_self):
     d = {
         'name': func.__name__,
         'doc': func.__doc__,
         }
 
-    # we mutate these dicts, so make copies
-    cmd_meta = copy.deepcopy(getattr(func, '_meta', {}))
-    cmd_params = cmd_meta.pop('params', {})
+    # we mutate these dicts (but nothing deeper), so make copies
+    cmd_meta = dict(getattr(func, '_meta', {}))
+    cmd_params = {
+        name: dict(p)
+        for name, p in cmd_meta.pop('params', {}).items()}
 
     sig = signature(func)
 
@@ -155,6 +210,20 @@ def func_to_dict(func, remove_self=False):
 
     return d
 
+# wire kind ints, mapped once instead of a dict literal per parameter
+_PARAM_KINDS = {
+    0: Param.POSITIONAL_ONLY,
+    1: Param.POSITIONAL_OR_KEYWORD,
+    2: Param.VAR_POSITIONAL,
+    3: Param.KEYWORD_ONLY,
+    4: Param.VAR_KEYWORD,
+    }
+
+# compiled stub code objects, keyed by source. identical signatures
+# recur across proxies and reconnects, and compile() is the expensive
+# half of the exec
+_stub_cache = {}
+
 def dict_to_func(d, callback):
     """Returns a function based on the metadata dict *d*, as created by
     `func_to_dict`.
@@ -174,19 +243,16 @@ def dict_to_func(d, callback):
     sig_defn = []
     sig_call = []
 
-    meta = copy.deepcopy(d)
+    # only the metadata dict and its param dicts are mutated below, so
+    # targeted copies are enough (see func_to_dict)
+    meta = dict(d)
+    meta['params'] = [dict(p) for p in d['params']]
     params = collections.OrderedDict()
 
     for p in meta.pop('params'):
         if not is_identifier(p['name']):
             raise ValueError('invalid parameter name: {}'.format(p['name']))
-        kind = {
-            0: Param.POSITIONAL_ONLY,
-            1: Param.POSITIONAL_OR_KEYWORD,
-            2: Param.VAR_POSITIONAL,
-            3: Param.KEYWORD_ONLY,
-            4: Param.VAR_KEYWORD,
-            }[p['kind']]
+        kind = _PARAM_KINDS[p['kind']]
 
         if kind == Param.KEYWORD_ONLY:
             # we assume these are part of kwargs
@@ -220,8 +286,12 @@ def dict_to_func(d, callback):
     src = tpl.format(d['name'], sig_defn, sig_call)
 
     # compile
+    try:
+        code = _stub_cache[src]
+    except KeyError:
+        code = _stub_cache[src] = compile(src, '<dict_to_func>', 'exec')
     g = {'callback': callback}
-    exec(src, g) # pylint: disable=exec-used
+    exec(code, g) # pylint: disable=exec-used
 
     func = g[meta.pop('name')]
     func.__doc__ = meta.pop('doc', None)
@@ -34,6 +34,20 @@ def iter_file(fp, chunk_size=None):
     for chunk in iter(lambda: fp.read(chunk_size), b''):
         yield chunk
 
+# module names per package: the filesystem walk only needs to happen
+# once, and import_module is already memoized by sys.modules
+_modnames_cache = {}
+
+def _iter_modnames(pkgname):
+    try:
+        return _modnames_cache[pkgname]
+    except KeyError:
+        path = base_path(pkgname.replace('.', '/'))
+        names = _modnames_cache[pkgname] = tuple(
+            modname for _, modname, ispkg in pkgutil.iter_modules([path])
+            if not ispkg)
+        return names
+
 def import_package(pkgname):
     """Imports all modules in a package (aka directory).
 
@@ -42,9 +56,7 @@ def import_package(pkgname):
     """
     exceptions = {}
 
-    path = base_path(pkgname.replace('.', '/'))
-    for _, modname, ispkg in pkgutil.iter_modules([path]):
-        if ispkg: continue
+    for modname in _iter_modnames(pkgname):
         exc = import_module(modname, pkgname)
         if exc:
             exceptions[modname] = exc
@@ -55,7 +67,7 @@ def import_module(modname, pkgname=None):
     """Imports a module, optionally from a package.
 
     Returns any exceptions."""
-    name = '.'.join(filter(None, [pkgname, modname]))
+    name = '{}.{}'.format(pkgname, modname) if pkgname else modname
     try:
         log.debug('loading: %s', name)
         if pkgname:
@@ -22,6 +22,15 @@ class Retry(object):
             if logger.isEnabledFor(logs.DEBUG) else log.warning)
         self.log_template = log_template or RETRY_LOG_TEMPLATE
 
+        if self.count == 0:
+            # the zero-retry default raises on the first error anyway,
+            # so skip the loop and try/except machinery entirely
+            self.call = self.call_gen = self._call_once
+
+    @staticmethod
+    def _call_once(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
     def call(self, func, *args, **kwargs):
         retries = 0
         count = self.count
@@ -9,8 +9,27 @@ DEFAULT_SCHEME = 'tcp'
 DEFAULT_HOST = '127.0.0.1'
 DEFAULT_PORT = 12321
 
+# formatted addresses recur constantly in logging and url paths (the
+# listen address, active peers), so memoize them. cleared wholesale if
+# churning peers ever fill it
+_addr_cache = {}
+
 def format_addr(addr):
-    return '{}:{}'.format(*addr)
+    try:
+        return _addr_cache[addr]
+    except KeyError:
+        pass
+    except TypeError: # unhashable
+        return '{}:{}'.format(*addr)
+    if len(_addr_cache) >= 1024:
+        _addr_cache.clear()
+    s = _addr_cache[addr] = '{}:{}'.format(*addr)
+    return s
+
+# parsed urls by source string. parsing is pure, and clients rebuild
+# the same Url on every reconnect, so share the parsed state the same
+# way the copy-constructor branch does
+_url_cache = {}
 
 class Url(object):
     def __init__(self, url):
@@ -18,9 +37,48 @@ class Url(object):
             self.__dict__ = url.__dict__
             return
 
+        try:
+            self.__dict__ = _url_cache[url]
+            return
+        except KeyError:
+            _key = url
+
         if ':/' not in url:
             url = '{}://{}'.format(DEFAULT_SCHEME, url)
 
+        scheme, sep, rest = url.partition('://')
+        # lowercase to match urlparse's scheme normalization
+        scheme = scheme.lower()
+        if (sep and scheme != 'unix'
+                and not any(c in rest for c in '/@?#[')):
+            # fast path for the dominant scheme://host[:port] shape.
+            # urlparse is a heavy general-purpose parser, and transports
+            # construct a Url per connection
+            host, colon, port = rest.rpartition(':')
+            if not colon:
+                host, port = port, ''
+            # match urlparse's rejections: a second ':' in the netloc or
+            # a non-numeric or out-of-range port
+            if ':' in host or (port and not port.isdigit()):
+                raise ValueError('invalid URL: {}'.format(url))
+            port = int(port) if port else 0
+            if port > 65535:
+                raise ValueError('invalid URL: {}'.format(url))
+
+            self._scheme = scheme
+            # lowercase to match urlparse's hostname normalization
+            self._host = (host.lower() or DEFAULT_HOST).replace(
+                '*', '0.0.0.0')
+            # `or` (not `if port else`) so port 0 falls back, matching
+            # the slow path's `u.port or DEFAULT_PORT`
+            self._port = port or DEFAULT_PORT
+            self._path = None
+            self._address = (self._host, self._port)
+            self._netloc = format_addr(self._address)
+            self._str = '{}://{}'.format(self._scheme, self._netloc)
+            self._intern(_key)
+            return
+
         u = urlparse(url)
 
         self._scheme = u.scheme
@@ -41,6 +99,16 @@ class Url(object):
             self._address = (self._host, self._port)
             self._netloc = format_addr(self._address)
 
+        # urls are immutable once parsed, so the formatted form is
+        # built once; __str__ and __eq__ run on every connection path
+        self._str = '{}://{}'.format(self._scheme, self._netloc)
+        self._intern(_key)
+
+    def _intern(self, key):
+        if len(_url_cache) >= 256:
+            _url_cache.clear()
+        _url_cache[key] = self.__dict__
+
     @property
     def scheme(self):
         return self._scheme
@@ -66,10 +134,15 @@ class Url(object):
         return self._netloc
 
     def __eq__(self, other):
-        return str(self) == str(other)
+        if type(other) is Url:
+            return self._str == other._str
+        return self._str == str(other)
+
+    def __hash__(self):
+        return hash(self._str)
 
     def __str__(self):
-        return '{}://{}'.format(self.scheme, self.netloc)
+        return self._str
 
     def __repr__(self):
-        return '{}({!r})'.format(self.__class__.__name__, str(self))
+        return '{}({!r})'.format(self.__class__.__name__, self._str)
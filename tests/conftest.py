@@ -1,3 +1,4 @@
+import time
 import socket
 import threading
 import subprocess
@@ -34,9 +35,31 @@ class Session(object):
             'snekrpc', '-S', '-u', self.url, '-i', 'tests.service',
             '-s', 'test', '-s', 'file', '-vv']
         self.proc = subprocess.Popen(cmd)
+        self.wait_ready()
+
+    def wait_ready(self, timeout=5.0):
+        # poll until the server accepts connections, so the first test
+        # doesn't burn its retry budget (and log noise) on startup
+        u = utils.url.Url(self.url)
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                if u.scheme == 'unix':
+                    s = socket.socket(socket.AF_UNIX)
+                    s.settimeout(0.1)
+                    s.connect(u.path)
+                else:
+                    s = socket.create_connection(u.address, 0.1)
+                s.close()
+                return
+            except (OSError, socket.error):
+                time.sleep(0.05)
 
     def stop_server(self):
         self.proc.terminate()
+        # don't let a dying server overlap the next session's startup
+        # (the unix sessions reuse the same socket path)
+        self.proc.wait()
 
 def start_thread(func, *args, **kwargs):
     t = threading.Thread(target=func, args=args, kwargs=kwargs)
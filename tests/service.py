@@ -34,3 +34,9 @@ class TestService(snekrpc.Service):
     def dualstream(self, stream):
         for x in stream:
             yield x
+
+    # small batch_bytes forces several stream_batch frames per stream
+    @snekrpc.command(batch_bytes=64, limit='int')
+    def downstream_batched(self, limit):
+        for x in range(limit):
+            yield x
@@ -1,3 +1,16 @@
+import shutil
+import subprocess
+
+import pytest
+
+import snekrpc
+from snekrpc.transport.tcp import TcpTransport
+
+from . import conftest
+from . import service as test_service
+
+SSL_URL = 'tcp://localhost:7358'
+
 def test_null(service):
     assert service.null() is None
 
@@ -27,3 +40,61 @@ def test_dualstream(service):
     rtup = list(range(10))
     result = list(service.dualstream(rtup))
     assert result == rtup
+
+def test_downstream_batched(service):
+    # batch_bytes=64 on the command forces several stream_batch frames
+    result = list(service.downstream_batched(limit=100))
+    assert result == list(range(100))
+
+def test_batch(session):
+    batch = session.get_client().batch()
+    assert batch.call('test', 'echo', 'one') == 0
+    assert batch.call('test', 'null') == 1
+    assert batch.call('test', 'echo', 'two') == 2
+    assert batch.commit() == ['one', None, 'two']
+
+def test_batch_error(session):
+    batch = session.get_client().batch()
+    batch.call('test', 'echo', 'ok')
+    batch.call('test', 'missing')
+    results = batch.commit()
+    assert results[0] == 'ok'
+    assert isinstance(results[1], snekrpc.errors.RemoteError)
+
+def test_batch_input_from(session):
+    batch = session.get_client().batch()
+    first = batch.call('test', 'echo', 'chained')
+    batch.call('test', 'echo', input_from=first)
+    assert batch.commit() == ['chained', 'chained']
+
+def test_batch_stream_arg(session):
+    batch = session.get_client().batch()
+    with pytest.raises(snekrpc.errors.ParameterError):
+        batch.call('test', 'upstream', (x for x in range(3)))
+
+def test_ssl(tmp_path):
+    openssl = shutil.which('openssl')
+    if not openssl:
+        pytest.skip('openssl not available')
+
+    cert = str(tmp_path / 'cert.pem')
+    key = str(tmp_path / 'key.pem')
+    subprocess.check_call([openssl, 'req', '-x509', '-newkey', 'rsa:2048',
+        '-nodes', '-keyout', key, '-out', cert, '-days', '1',
+        '-subj', '/CN=localhost', '-addext', 'subjectAltName=DNS:localhost'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    server = snekrpc.Server(
+        TcpTransport(SSL_URL, ssl_cert=cert, ssl_key=key))
+    server.add_service(test_service.TestService)
+    conftest.start_thread(server.serve)
+
+    try:
+        client = snekrpc.Client(
+            TcpTransport(SSL_URL, ssl_cert=cert), retry_count=2)
+        svc = client.service('test')
+        assert svc.echo('over tls') == 'over tls'
+        assert list(svc.downstream(limit=10)) == list(range(10))
+    finally:
+        server.stop()
+        server.join(5)
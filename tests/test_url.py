@@ -139,8 +139,24 @@ def test_to_str():
     u = Url(url)
     assert url == str(u)
 
+def test_scheme_case():
+    u = Url('TCP://{}:{}'.format(TEST_HOST, TEST_PORT))
+
+    assert u.scheme == 'tcp'
+    assert u.host == TEST_HOST
+    assert u.port == TEST_PORT
+
+def test_port_zero():
+    u = Url('tcp://{}:0'.format(TEST_HOST))
+
+    assert u.port == DEFAULT_PORT
+
 def test_invalid():
     with pytest.raises(ValueError):
         Url('xxx:/asdf')
     with pytest.raises(ValueError):
         Url('tcp://asdf/asdf')
+    with pytest.raises(ValueError):
+        Url('tcp://a:b:1')
+    with pytest.raises(ValueError):
+        Url('tcp://{}:99999'.format(TEST_HOST))